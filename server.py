@@ -28,9 +28,10 @@ from pathlib import Path
 from typing import Dict, List, Optional
 
 import chess
-from flask import Flask, jsonify, request
+from flask import Flask, jsonify, request, send_file
 
-from src.llmchess_simple.game import GameConfig, GameRunner
+from src.llmchess_simple.config import SETTINGS
+from src.llmchess_simple.game import GameConfig, GameRunner, PlyRecord
 from src.llmchess_simple.llm_opponent import LLMOpponent
 from src.llmchess_simple.prompting import DEFAULT_SYSTEM_INSTRUCTIONS, DEFAULT_TEMPLATE, PromptConfig
 from src.llmchess_simple.user_opponent import UserOpponent
@@ -48,6 +49,18 @@ LOG_ROOT.mkdir(parents=True, exist_ok=True)
 MAX_PARALLEL_GAMES = max(1, int(os.environ.get("EXPERIMENT_MAX_CONCURRENCY", 4)))
 HUMAN_GAMES: Dict[str, dict] = {}
 HUMAN_GAME_TTL_S = 3600  # drop inactive human games after an hour to avoid leaks
+_GAME_POOL: Optional[concurrent.futures.ThreadPoolExecutor] = None
+
+
+def _game_pool() -> concurrent.futures.ThreadPoolExecutor:
+    """Shared worker pool for experiment games, created on first use and kept warm across runs."""
+    global _GAME_POOL
+    with lock:
+        if _GAME_POOL is None:
+            _GAME_POOL = concurrent.futures.ThreadPoolExecutor(
+                max_workers=MAX_PARALLEL_GAMES, thread_name_prefix="llmchess-game"
+            )
+        return _GAME_POOL
 
 
 def _slugify_experiment_name(name: str) -> str:
@@ -388,7 +401,7 @@ def _play_ai_turn(session: dict) -> tuple[Optional[dict], str]:
         _mark_finished(session, result, f"ai_move_error:{exc}")
         return None, runner.ref.board.fen()
     session["last_ai_raw"] = meta.get("raw") if meta else None
-    runner.records.append({"actor": "LLM", "uci": uci, "ok": ok, "ms": ms, "san": san, "meta": meta})
+    runner.append_record(PlyRecord(actor="LLM", uci=uci, ok=ok, san=san, ms=ms, meta=meta))
     runner._global_ply = getattr(runner, "_global_ply", 0) + 1
     session["updated_at"] = time.time()
 
@@ -436,7 +449,7 @@ def _apply_human_move(session: dict, raw_move: str) -> tuple[Optional[str], bool
 
     san = runner.ref.engine_apply(mv)
     _append_conversation(session, {"role": "human", "content": f"You played {san} ({mv.uci()})", "actor": "human", "side": session.get("human_side")})
-    runner.records.append({"actor": "OPP", "uci": mv.uci(), "ok": True, "san": san, "meta": {"actor": "human", "raw": raw_move}})
+    runner.append_record(PlyRecord(actor="OPP", uci=mv.uci(), ok=True, san=san, meta={"actor": "human", "raw": raw_move}))
     runner._global_ply = getattr(runner, "_global_ply", 0) + 1
     session["updated_at"] = time.time()
 
@@ -500,8 +513,6 @@ def _run_experiment(exp_id: str) -> None:
             exp["games"]["completed"] = exp["games"].get("completed", 0)
             _persist_update()
 
-    max_workers = max(1, min(total, MAX_PARALLEL_GAMES))
-
     def _play_game(row: dict):
         if cancel_event and cancel_event.is_set():
             return None
@@ -516,6 +527,7 @@ def _run_experiment(exp_id: str) -> None:
             opponent_prompt_cfg=prompt_cfg,
             conversation_log_path=str(log_dir),
             conversation_log_every_turn=True,
+            history_dump_every_turn=True,  # live board polls /history while the game runs
             game_log=False,
             cancel_event=cancel_event,
         )
@@ -586,15 +598,28 @@ def _run_experiment(exp_id: str) -> None:
             exp_local["games"]["completed"] = exp_local["games"].get("completed", 0) + 1
             _persist_update()
 
-    executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
-    futures = [executor.submit(_play_game, row) for row in game_rows]
+    pool = _game_pool()
+    # Keep at most two games per worker queued for this experiment; later rows are
+    # submitted as earlier ones finish, so concurrent experiments interleave on the pool.
+    window = 2 * MAX_PARALLEL_GAMES
+    pending_rows = iter(game_rows)
+    inflight: set[concurrent.futures.Future] = set()
     try:
-        for future in concurrent.futures.as_completed(futures):
-            future.result()
+        while True:
+            while len(inflight) < window:
+                row = next(pending_rows, None)
+                if row is None:
+                    break
+                inflight.add(pool.submit(_play_game, row))
+            if not inflight:
+                break
+            done, inflight = concurrent.futures.wait(inflight, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                exc = future.exception()
+                if exc is not None:
+                    # One failed game must not stop the rest of the experiment from being played
+                    logging.error("Experiment %s game worker failed", exp_id, exc_info=exc)
             if cancel_event and cancel_event.is_set():
-                for f in futures:
-                    f.cancel()
-                executor.shutdown(wait=False, cancel_futures=True)
                 with lock:
                     exp = STATE.get(exp_id)
                     if exp:
@@ -604,7 +629,10 @@ def _run_experiment(exp_id: str) -> None:
                 CANCEL_EVENTS.pop(exp_id, None)
                 return
     finally:
-        executor.shutdown(wait=True)
+        # The pool outlives this experiment: drop queued games, wait for running ones
+        for f in inflight:
+            f.cancel()
+        concurrent.futures.wait(inflight)
 
     with lock:
         exp = STATE.get(exp_id)
@@ -797,6 +825,7 @@ def create_human_game():
         conversation_log_path=None,  # disable file logging for human games
         conversation_log_every_turn=False,
         game_log=False,
+        request_timeout_s=SETTINGS.interactive_timeout_s,  # a human is waiting; fail over to a retry sooner
     )
     runner = GameRunner(model=model, opponent=UserOpponent(), cfg=cfg)
     start_fen = runner.ref.board.fen()
@@ -876,19 +905,23 @@ def human_game_move(game_id: str):
             ai_move, fen_after_ai = _play_ai_turn(session)
         return jsonify(_serialize_human_session(session, fen_after_human=fen_after_human, ai_move=ai_move, fen_after_ai=fen_after_ai))
 
+def _json_file_response(path: str | Path):
+    """Serve a JSON log file as-is; it is already valid JSON, so skip the parse/re-encode."""
+    # send_file resolves relative paths against app.root_path; the stored paths are cwd-relative
+    return send_file(Path(path).resolve(), mimetype="application/json", conditional=False)
+
+
 @app.route("/api/games/<game_id>/conversation", methods=["GET"])
 def game_conversation(game_id: str):
     rec = _find_game_record(game_id)
     if rec and rec.get("conversation_path") and Path(rec["conversation_path"]).exists():
-        with open(rec["conversation_path"], "r", encoding="utf-8") as f:
-            return jsonify(json.load(f))
+        return _json_file_response(rec["conversation_path"])
     # Fallback: search on disk in case state is stale
     search_root = Path(LOG_ROOT)
     for path in search_root.rglob(f"{game_id}"):
         conv = path / "conversation.json"
         if conv.exists():
-            with open(conv, "r", encoding="utf-8") as f:
-                return jsonify(json.load(f))
+            return _json_file_response(conv)
     return jsonify({"error": "not found"}), 404
 
 
@@ -896,19 +929,16 @@ def game_conversation(game_id: str):
 def game_history(game_id: str):
     rec = _find_game_record(game_id)
     if rec and rec.get("history_path") and Path(rec["history_path"]).exists():
-        with open(rec["history_path"], "r", encoding="utf-8") as f:
-            return jsonify(json.load(f))
+        return _json_file_response(rec["history_path"])
     # Fallback: search on disk if state is stale or missing
     search_root = Path(LOG_ROOT)
     for path in search_root.rglob(f"{game_id}"):
         # prefer exact history.json, else any hist_* file
         hist_exact = path / "history.json"
         if hist_exact.exists():
-            with open(hist_exact, "r", encoding="utf-8") as f:
-                return jsonify(json.load(f))
+            return _json_file_response(hist_exact)
         for hist_file in path.glob("hist_*.json"):
-            with open(hist_file, "r", encoding="utf-8") as f:
-                return jsonify(json.load(f))
+            return _json_file_response(hist_file)
     return jsonify({"error": "not found"}), 404
 
 
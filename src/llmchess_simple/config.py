@@ -54,6 +54,12 @@ def _get(name: str, default: Any, cast: Callable[[Any], Any] | None = None) -> A
     return default
 
 
+def _as_bool(val: Any) -> bool:
+    if isinstance(val, str):
+        return val.strip().lower() in {"1", "true", "yes", "on"}
+    return bool(val)
+
+
 @dataclass(frozen=True)
 class Settings:
     # Auth / endpoint (Vercel AI Gateway, OpenAI-compatible wire format)
@@ -63,13 +69,25 @@ class Settings:
     # Tuning knobs
     responses_timeout_s: float
     responses_retries: int
+    interactive_timeout_s: float
     max_concurrency: int
+    requests_per_minute: int
+    tokens_per_minute: int
+    stream_early_stop: bool
+    prompt_cache_key: bool
+    coalesce_requests: bool
 
 
 SETTINGS = Settings(
     llm_api_key=_get("LLMCHESS_LLM_API_KEY", _get("AI_GATEWAY_API_KEY", "")),
     api_base=_get("LLMCHESS_LLM_BASE_URL", _get("AI_GATEWAY_BASE_URL", "https://ai-gateway.vercel.sh/v1")),
     responses_timeout_s=float(_get("LLMCHESS_RESPONSES_TIMEOUT_S", 300.0, cast=float)),
-    responses_retries=int(_get("LLMCHESS_RESPONSES_RETRIES", 4, cast=int)),
+    responses_retries=int(_get("LLMCHESS_RESPONSES_RETRIES", 8, cast=int)),
+    interactive_timeout_s=float(_get("LLMCHESS_INTERACTIVE_TIMEOUT_S", 60.0, cast=float)),
     max_concurrency=int(_get("LLMCHESS_MAX_CONCURRENCY", 8, cast=int)),
+    requests_per_minute=int(_get("LLMCHESS_REQUESTS_PER_MINUTE", 0, cast=int)),
+    tokens_per_minute=int(_get("LLMCHESS_TOKENS_PER_MINUTE", 0, cast=int)),
+    stream_early_stop=_get("LLMCHESS_STREAM_EARLY_STOP", False, cast=_as_bool),
+    prompt_cache_key=_get("LLMCHESS_PROMPT_CACHE_KEY", False, cast=_as_bool),
+    coalesce_requests=_get("LLMCHESS_COALESCE_REQUESTS", False, cast=_as_bool),
 )
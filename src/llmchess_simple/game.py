@@ -6,22 +6,68 @@ Single-game runner and config.
   - Builds prompts (plaintext/FEN) via prompting.py, calls llm_client, normalizes via agent_normalizer,
     validates with move_validator, and applies moves through Referee.
   - Logs per-turn conversation and structured history JSON for visualization.
-  - Exposes step_* helpers for orchestrated runs and summary/metrics at the end.
+  - Exposes step_* (sync) and astep_* (async) helpers for orchestrated runs and summary/metrics at the end.
 
 """
 from __future__ import annotations
-import time, logging, statistics, json, threading
+import asyncio, bisect, hashlib, time, logging, json, threading
 import chess
 from dataclasses import dataclass, field
 import os
 from datetime import datetime
 from .referee import Referee
-from .llm_client import ask_for_best_move_conversation, SYSTEM
-from .llm_play import build_prompt_messages_for_board, process_llm_raw_move
+from .llm_client import ask_for_best_move_conversation, ask_for_best_move_conversation_async, SYSTEM
+from .llm_play import HistoryCache, build_prompt_messages_for_board, process_llm_raw_move
 from .llm_opponent import LLMOpponent
 from .user_opponent import UserOpponent
 from .prompting import PromptConfig
 
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None  # falls back to stdlib json for log dumps
+
+
+def _prompt_sha(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _dumps_json(data) -> bytes:
+    """Serialize a full log file (pretty, UTF-8) with orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+
+
+def _dumps_line(data) -> bytes:
+    """Serialize one compact NDJSON line (newline included) straight to bytes."""
+    if orjson is not None:
+        return orjson.dumps(data, default=str, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=str) + "\n").encode("utf-8")
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    """Write a log file via a sibling temp file + os.replace so pollers never read a partial file."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    try:
+        os.replace(tmp, path)
+    except OSError:
+        # e.g. Windows refuses to replace a file a reader still has open: write in place instead
+        with open(path, "wb") as f:
+            f.write(data)
+        os.remove(tmp)
+
+
+def _p95(sorted_xs: list[int]) -> int:
+    """95th percentile of an already-sorted list (max for small samples)."""
+    if not sorted_xs:
+        return 0
+    if len(sorted_xs) < 20:
+        return sorted_xs[-1]
+    return sorted_xs[int(0.95 * (len(sorted_xs) - 1))]
+
 
 @dataclass
 class GameConfig:
@@ -29,7 +75,7 @@ class GameConfig:
     pgn_tail_plies: int = 20 
     # Conversation/trace logging
     conversation_log_path: str | None = None  # optional path or directory to dump reconstructed conversation JSON
-    conversation_log_every_turn: bool = True  # write conversation and structured history after every ply
+    conversation_log_every_turn: bool = True  # append each ply to a sibling .ndjson stream; full JSON is written at game end
     # Side and validation
     color: str = "white"
     # Modular prompting configuration
@@ -37,9 +83,39 @@ class GameConfig:
     opponent_prompt_cfg: PromptConfig | None = None
     # Console logging of moves as they happen
     game_log: bool = False
+    # Per-request timeout for this runner's own LLM calls (None = LLMCHESS_RESPONSES_TIMEOUT_S)
+    request_timeout_s: float | None = None
+    # Keep full per-ply user prompts in record meta; when False only a short hash is kept
+    # and export_conversation rebuilds the prompt text from the replayed board.
+    store_prompts_in_meta: bool = False
+    # Rewrite the full conversation/history JSON every K plies as a checkpoint (0 = only at game end)
+    full_dump_every_k_plies: int = 0
+    # Rewrite only the (small) structured history JSON after every ply, for live viewers polling it
+    history_dump_every_turn: bool = False
     cancel_event: threading.Event | None = None
 
 
+@dataclass(slots=True)
+class PlyRecord:
+    """One recorded ply. Slotted to keep long games light; get()/[] keep the old dict-style reads working."""
+    actor: str
+    uci: str | None
+    ok: bool
+    san: str | None
+    ms: int | None = None
+    meta: dict | None = None
+    move: chess.Move | None = None  # applied move, so history replay skips re-parsing UCI
+
+    def get(self, key: str, default=None):
+        return getattr(self, key, default)
+
+    def __getitem__(self, key: str):
+        return getattr(self, key)
+
+    def to_dict(self) -> dict:
+        return {"actor": self.actor, "uci": self.uci, "ok": self.ok, "san": self.san, "ms": self.ms, "meta": self.meta}
+
+
 class GameRunner:
     def __init__(self, model: str, opponent, cfg: GameConfig | None = None):
         self.log = logging.getLogger("GameRunner")
@@ -49,6 +125,7 @@ class GameRunner:
         self.ref = Referee()
         self.cancel_event = getattr(self.cfg, "cancel_event", None)
         
+        self._opp_name_cached = self._resolve_opp_name()
         # Determine if LLM plays white based on cfg.color only
         self._is_white = str(getattr(self.cfg, "color", "white")).lower() == "white"
         # Decide headers based on side
@@ -56,7 +133,21 @@ class GameRunner:
             self.ref.set_headers(white=self.model, black=self._opp_name())
         else:
             self.ref.set_headers(white=self._opp_name(), black=self.model)
-        self.records: list[dict] = []  # list of dicts per ply
+        self.records: list[PlyRecord] = []  # one PlyRecord per ply
+        # Incremental caches so per-turn prompt/history builds only process new plies
+        self._hist_cache = HistoryCache()
+        self._struct_board = chess.Board()
+        self._struct_moves: list[dict] = []
+        self._struct_rec_idx = 0  # number of records already folded into _struct_moves
+        self._verify_error: str | None = None  # first inconsistency seen while folding records
+        # Running metrics counters, updated by append_record
+        self._llm_moves = 0
+        self._llm_legal = 0
+        self._llm_illegal = 0
+        self._opp_illegal = 0
+        self._latencies: list[int] = []  # kept sorted so p95 is a direct index
+        self._latency_sum = 0
+        self._last_illegal_llm_raw: str | None = None
         self.termination_reason: str | None = None
         self.start_ts = time.time()
         # Prepare conversation log path: treat path as directory or file
@@ -67,6 +158,13 @@ class GameRunner:
         return bool(self.cancel_event and self.cancel_event.is_set())
 
     def _prepare_conv_log_path(self):
+        """Resolve conversation and structured-history file paths once, creating parent dirs.
+
+        Per-turn dumps reuse the cached paths and skip all stat/mkdir calls.
+        """
+        self._conv_file_path: str | None = None
+        self._hist_file_path: str | None = None
+        self._conv_ndjson_fp = None
         p = self.cfg.conversation_log_path
         if not p:
             return
@@ -86,9 +184,23 @@ class GameRunner:
                     os.makedirs(dir_path, exist_ok=True)
                 resolved = p
             self.cfg.conversation_log_path = resolved
+            self._conv_file_path = resolved
+            # Structured history is a sibling file: conv_* -> hist_*, otherwise <name>_history.json
+            hist_base = os.path.basename(resolved)
+            if hist_base.startswith("conv_"):
+                hist_base = "hist_" + hist_base[len("conv_"):]
+            else:
+                name, hist_ext = os.path.splitext(hist_base)
+                hist_base = f"{name}_history{hist_ext or '.json'}"
+            self._hist_file_path = os.path.join(os.path.dirname(resolved), hist_base)
+            if self.cfg.conversation_log_every_turn:
+                # Per-ply records are appended here; relies on OS buffering rather than flushing each turn
+                self._conv_ndjson_fp = open(os.path.splitext(resolved)[0] + ".ndjson", "ab")
         except Exception:
             self.log.exception("Failed to prepare conversation log path; disabling conversation logging")
             self.cfg.conversation_log_path = None
+            self._conv_file_path = None
+            self._hist_file_path = None
 
     # --------------- Structured history export ---------------
     def export_structured_history(self) -> dict:
@@ -96,41 +208,10 @@ class GameRunner:
         Includes headers, result, termination reason, and per-ply entries with SAN, UCI, FENs.
         """
         start_fen = chess.STARTING_FEN
-        board = chess.Board()
-        moves = []
-        ply_idx = 0
-        for rec in self.records:
-            uci = rec.get("uci")
-            if not uci:
-                continue
-            try:
-                mv = chess.Move.from_uci(uci)
-            except Exception:
-                continue
-            san = None
-            legal = mv in board.legal_moves
-            if legal:
-                san = board.san(mv)
-                board.push(mv)
-            fen_after = board.fen()
-            meta = rec.get("meta") or {}
-            moves.append({
-                "ply": ply_idx + 1,
-                "side": "white" if (ply_idx % 2 == 0) else "black",
-                "uci": uci,
-                "san": san,
-                "legal": bool(legal),
-                "fen": fen_after,
-                "raw": meta.get("raw"),
-                "model": meta.get("model") or (self.model if rec.get("actor") == "LLM" else getattr(self.opp, "model", None)),
-            })
-            ply_idx += 1
-        # After building moves list, derive last_illegal_raw from records
-        last_illegal_raw = None
-        for rec in reversed(self.records):
-            if rec.get("actor") == "LLM" and rec.get("ok") is False:
-                last_illegal_raw = (rec.get("meta") or {}).get("raw")
-                break
+        self._advance_structured_moves()
+        moves = list(self._struct_moves)
+        # Tracked by append_record so termination metadata needs no reverse scan of records
+        last_illegal_raw = self._last_illegal_llm_raw
         data = {
             "headers": getattr(self.ref, "_headers", {}),
             "initial_fen": start_fen,
@@ -167,42 +248,60 @@ class GameRunner:
             data["moves"].append(evt)
         return data
 
+    def _advance_structured_moves(self):
+        """Fold records appended since the last export into the cached per-ply move entries."""
+        board = self._struct_board
+        for rec in self.records[self._struct_rec_idx:]:
+            self._struct_rec_idx += 1
+            uci = rec.uci
+            if not uci:
+                continue
+            mv = rec.move
+            if mv is None:
+                try:
+                    mv = chess.Move.from_uci(uci)
+                except Exception:
+                    self._verify_error = self._verify_error or f"bad_uci_in_history:{uci}"
+                    continue
+            ply_idx = len(self._struct_moves)
+            san = None
+            legal = board.is_legal(mv)
+            if legal:
+                san = board.san(mv)
+                board.push(mv)
+            else:
+                self._verify_error = self._verify_error or f"illegal_sequence_at:{uci}"
+            meta = rec.meta or {}
+            self._struct_moves.append({
+                "ply": ply_idx + 1,
+                "side": "white" if (ply_idx % 2 == 0) else "black",
+                "uci": uci,
+                "san": san,
+                "legal": bool(legal),
+                "fen": board.fen(),
+                "raw": meta.get("raw"),
+                "model": meta.get("model") or (self.model if rec.actor == "LLM" else getattr(self.opp, "model", None)),
+            })
+
     def _structured_history_path(self) -> str | None:
-        p = self.cfg.conversation_log_path
-        if not p:
-            return None
-        # If conversation_log_path is a directory, write history.json inside; if file, create a sibling with hist_ prefix
-        if os.path.isdir(p) or os.path.splitext(p)[1] == "":
-            try:
-                os.makedirs(p, exist_ok=True)
-            except Exception:
-                pass
-            return os.path.join(p, "history.json")
-        dir_path = os.path.dirname(p)
-        base = os.path.basename(p)
-        if base.startswith("conv_"):
-            base = "hist_" + base[len("conv_"):]
-        else:
-            name, ext = os.path.splitext(base)
-            base = f"{name}_history{ext or '.json'}"
-        return os.path.join(dir_path, base)
+        # Resolved once in _prepare_conv_log_path (sibling of the conversation log)
+        return self._hist_file_path
 
     def dump_structured_history_json(self):
-        path = self._structured_history_path()
+        path = self._hist_file_path
         if not path:
             return
         try:
             d = self.export_structured_history()
-            dir_path = os.path.dirname(path)
-            if dir_path:
-                os.makedirs(dir_path, exist_ok=True)
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(d, f, ensure_ascii=False, indent=2)
+            _write_atomic(path, _dumps_json(d))
             self.log.info("Wrote structured history to %s", path)
         except Exception:
             self.log.exception("Failed writing structured history")
 
     def _opp_name(self) -> str:
+        return self._opp_name_cached
+
+    def _resolve_opp_name(self) -> str:
         # Prefer explicit label/model for LLM opponents
         if isinstance(self.opp, LLMOpponent):
             return self.opp.label()
@@ -218,13 +317,41 @@ class GameRunner:
             return "human"
         return "other"
 
+    def append_record(self, rec: PlyRecord | dict):
+        """Append a ply record and update the running metrics counters.
+        Applied moves keep their chess.Move on the record so history replay skips re-parsing UCI.
+        """
+        if isinstance(rec, dict):
+            rec = PlyRecord(**rec)
+        meta = rec.meta
+        if meta and not self.cfg.store_prompts_in_meta and meta.get("prompt"):
+            meta["prompt_sha"] = _prompt_sha(meta.pop("prompt"))
+        uci = rec.uci
+        if rec.ok and uci and rec.move is None and self.ref.board.move_stack:
+            mv = self.ref.board.peek()
+            if mv.uci() == uci:
+                rec.move = mv
+        self.records.append(rec)
+        if rec.actor == "LLM":
+            self._llm_moves += 1
+            if rec.ok:
+                self._llm_legal += 1
+            else:
+                self._llm_illegal += 1
+                self._last_illegal_llm_raw = (meta or {}).get("raw")
+            if rec.ms is not None:
+                bisect.insort(self._latencies, rec.ms)
+                self._latency_sum += rec.ms
+        elif rec.actor == "OPP" and not rec.ok:
+            self._opp_illegal += 1
+
     # New helpers for orchestrated runs
     def needs_llm_turn(self) -> bool:
         if self.ref.status() != "*":
             return False
         return (self.ref.board.turn == chess.WHITE and self._is_white) or (self.ref.board.turn == chess.BLACK and not self._is_white)
 
-    def build_llm_messages(self) -> list[dict]:
+    def build_llm_messages(self, fen: str | None = None) -> list[dict]:
         """Build the messages for the next LLM turn according to prompt config."""
         side = "white" if self.ref.board.turn == chess.WHITE else "black"
         # Starting context if LLM is white and no moves yet
@@ -235,25 +362,28 @@ class GameRunner:
             prompt_cfg=self.cfg.prompt_cfg,
             pgn_tail_plies=self.cfg.pgn_tail_plies,
             is_starting=is_starting,
+            history_cache=self._hist_cache,
+            fen=fen,
         )
 
-    def step_llm_with_raw(self, raw: str):
-        """Process a provided raw LLM reply as the current move, record it, and handle termination state."""
-        fen = self.ref.board.fen()
+    def step_llm_with_raw(self, raw: str, messages: list[dict] | None = None):
+        """Process a provided raw LLM reply as the current move, record it, and handle termination state.
+        Pass the messages the reply was generated from to skip rebuilding the prompt for metadata.
+        """
         # Recover prompts for metadata
-        msgs = self.build_llm_messages()
-        if self.cfg.conversation_log_path:
+        msgs = messages if messages is not None else self.build_llm_messages()
+        if self._conv_ndjson_fp:
             pending_prompt = {
                 "system": msgs[0]["content"] if msgs else "",
                 "prompt": msgs[-1]["content"] if msgs else "",
                 "model": self.model,
             }
-            self.dump_conversation_json(pending_prompt=pending_prompt)
+            self._stream_event("pending_prompt", pending_prompt)
         user_prompt_text = msgs[-1]["content"] if msgs else ""
         sys_prompt_text = msgs[0]["content"] if msgs else ""
         ok, uci, san, ms, meta, _ = process_llm_raw_move(
             raw,
-            fen,
+            self.ref.board,
             apply_uci_fn=self.ref.apply_uci,
             log=self.log,
             meta_extra={
@@ -264,7 +394,7 @@ class GameRunner:
             },
             expected_notation=getattr(self.cfg.prompt_cfg, "expected_notation", "san"),
         )
-        self.records.append({"actor": "LLM", "uci": uci, "ok": ok, "ms": ms, "san": san, "meta": meta})
+        self.append_record(PlyRecord(actor="LLM", uci=uci, ok=ok, san=san, ms=ms, meta=meta))
         # Console-friendly log of LLM action
         if self.cfg.game_log:
             disp = san or (uci or "(no-move)")
@@ -274,9 +404,8 @@ class GameRunner:
             self.log.info("[ply %d] LLM: move=%s legal=%s time_ms=%d raw='%s'", self._global_ply+1, disp, ok, ms, raw_short)
         else:
             self.log.debug("Ply %d LLM move %s ok=%s san=%s ms=%d", self._global_ply+1, uci, ok, san, ms)
-        if self.cfg.conversation_log_path and self.cfg.conversation_log_every_turn:
-            self.dump_conversation_json()
-            self.dump_structured_history_json()
+        self._stream_event("ply", self.records[-1])
+        self._checkpoint_logs()
         if not ok:
             # first illegal LLM move loses immediately
             self.termination_reason = "illegal_llm_move"
@@ -287,11 +416,32 @@ class GameRunner:
         return ok
 
     def step_opponent(self):
-        ok, uci, san, meta = self._opp_turn()
+        return self._record_opp_step(*self._opp_turn())
+
+    async def astep_llm(self):
+        """Async LLM turn: await the model reply, then record it like step_llm_with_raw.
+        Lets many runners overlap their network waits on one event loop.
+        """
+        if self._cancelled():
+            return False
+        fen = self.ref.board.fen()
+        messages = self.build_llm_messages(fen=fen)
+        raw = await ask_for_best_move_conversation_async(messages, model=self.model, fen=fen, expected_notation=getattr(self.cfg.prompt_cfg, "expected_notation", "san"), timeout=self.cfg.request_timeout_s)
+        return self.step_llm_with_raw(raw, messages=messages)
+
+    async def astep_opponent(self):
+        """Async opponent turn. LLM opponents await their reply; others run in a worker thread."""
+        if isinstance(self.opp, LLMOpponent) and not self._cancelled():
+            turn = await self.opp.achoose_llm(**self._llm_opp_kwargs())
+        else:
+            turn = await asyncio.to_thread(self._opp_turn)
+        return self._record_opp_step(*turn)
+
+    def _record_opp_step(self, ok, uci, san, meta):
         ms = None
         if meta:
             ms = meta.get("latency_ms")
-        self.records.append({"actor": "OPP", "uci": uci, "ok": ok, "san": san, "ms": ms, "meta": meta})
+        self.append_record(PlyRecord(actor="OPP", uci=uci, ok=ok, san=san, ms=ms, meta=meta))
         if self.cfg.game_log:
             raw_short = ""
             if meta and meta.get("raw"):
@@ -301,9 +451,8 @@ class GameRunner:
             self.log.info("[ply %d] OPP: move=%s (%s) raw='%s'", self._global_ply+1, san or uci, uci, raw_short)
         else:
             self.log.debug("Ply %d OPP move %s san=%s", self._global_ply+1, uci, san)
-        if self.cfg.conversation_log_path and self.cfg.conversation_log_every_turn:
-            self.dump_conversation_json()
-            self.dump_structured_history_json()
+        self._stream_event("ply", self.records[-1])
+        self._checkpoint_logs()
         if not ok:
             self.termination_reason = self.termination_reason or "illegal_opponent_move"
             result = "1-0" if self._is_white else "0-1"
@@ -315,21 +464,21 @@ class GameRunner:
     def _llm_turn_standard(self):
         if self._cancelled():
             return False, None, None, None, {}
-        messages = self.build_llm_messages()
-        if self.cfg.conversation_log_path:
+        fen = self.ref.board.fen()
+        messages = self.build_llm_messages(fen=fen)
+        if self._conv_ndjson_fp:
             pending_prompt = {
                 "system": messages[0]["content"] if messages else "",
                 "prompt": messages[-1]["content"] if messages else "",
                 "model": self.model,
             }
-            self.dump_conversation_json(pending_prompt=pending_prompt)
-        raw = ask_for_best_move_conversation(messages, model=self.model)
-        fen = self.ref.board.fen()
+            self._stream_event("pending_prompt", pending_prompt)
+        raw = ask_for_best_move_conversation(messages, model=self.model, fen=fen, expected_notation=getattr(self.cfg.prompt_cfg, "expected_notation", "san"), timeout=self.cfg.request_timeout_s)
         user_prompt_text = messages[-1]["content"] if messages else ""
         sys_prompt_text = messages[0]["content"] if messages else ""
         ok, uci, san, agent_ms, meta, _ = process_llm_raw_move(
             raw,
-            fen,
+            self.ref.board,
             apply_uci_fn=self.ref.apply_uci,
             log=self.log,
             meta_extra={
@@ -346,14 +495,7 @@ class GameRunner:
         if self._cancelled():
             return False, None, None, {}
         if isinstance(self.opp, LLMOpponent):
-            ok, uci, san, meta = self.opp.choose_llm(
-                board=self.ref.board,
-                apply_uci_fn=self.ref.apply_uci,
-                pgn_tail_plies=self.cfg.pgn_tail_plies,
-                log=self.log,
-                prompt_cfg=self.cfg.opponent_prompt_cfg or self.cfg.prompt_cfg,
-                on_prompt=(lambda pending: self.dump_conversation_json(pending_prompt=pending)) if self.cfg.conversation_log_path else None,
-            )
+            ok, uci, san, meta = self.opp.choose_llm(**self._llm_opp_kwargs())
             return ok, uci, san, meta
         if isinstance(self.opp, UserOpponent):
             mv = self.opp.choose(self.ref.board)
@@ -363,6 +505,17 @@ class GameRunner:
         san = self.ref.engine_apply(mv)
         return True, mv.uci(), san, {}
 
+    def _llm_opp_kwargs(self) -> dict:
+        return {
+            "board": self.ref.board,
+            "apply_uci_fn": self.ref.apply_uci,
+            "pgn_tail_plies": self.cfg.pgn_tail_plies,
+            "log": self.log,
+            "prompt_cfg": self.cfg.opponent_prompt_cfg or self.cfg.prompt_cfg,
+            "on_prompt": (lambda pending: self._stream_event("pending_prompt", pending)) if self._conv_ndjson_fp else None,
+            "history_cache": self._hist_cache,
+        }
+
     # ---------------- Export / Verification -----------------
     def export_conversation(self, pending_prompt: dict | None = None) -> list[dict]:
         """Return a chat-style list of messages representing the interaction.
@@ -371,10 +524,9 @@ class GameRunner:
         messages: list[dict] = []
         llm_sys_added = False
         opp_sys_added = False
-        for rec in self.records:
-            meta = rec.get("meta", {})
-            actor = rec.get("actor")
-            prompt = meta.get("prompt")
+        for rec, prompt in zip(self.records, self._record_prompts()):
+            meta = rec.meta or {}
+            actor = rec.actor
             raw = meta.get("raw") or meta.get("assistant_raw") or ""
             sys_text = meta.get("system")
             model_name = meta.get("model") or (self.model if actor == "LLM" else getattr(self.opp, "model", None))
@@ -405,37 +557,97 @@ class GameRunner:
                 messages.append({"role": "user", "content": prompt_text, "model": model_name})
         return messages
 
+    def _record_prompts(self) -> list[str | None]:
+        """User prompt per record: stored text, or rebuilt from the replayed board when only a hash was kept."""
+        prompts = [(rec.meta or {}).get("prompt") for rec in self.records]
+        if not any((rec.meta or {}).get("prompt_sha") for rec in self.records):
+            return prompts
+        board = chess.Board()
+        cache = HistoryCache()
+        for i, rec in enumerate(self.records):
+            meta = rec.meta or {}
+            sha = meta.get("prompt_sha")
+            if sha and prompts[i] is None:
+                prompt_cfg = self.cfg.prompt_cfg if rec.actor == "LLM" else (self.cfg.opponent_prompt_cfg or self.cfg.prompt_cfg)
+                msgs = build_prompt_messages_for_board(
+                    board=board,
+                    side="white" if board.turn == chess.WHITE else "black",
+                    prompt_cfg=prompt_cfg,
+                    pgn_tail_plies=self.cfg.pgn_tail_plies,
+                    is_starting=len(board.move_stack) == 0,
+                    history_cache=cache,
+                )
+                text = msgs[-1]["content"] if msgs else ""
+                if _prompt_sha(text) == sha:
+                    prompts[i] = text
+                else:
+                    self.log.warning("Could not reconstruct prompt for ply %d (hash mismatch)", i + 1)
+            mv = rec.move
+            if mv is None and rec.ok and rec.uci:
+                try:
+                    mv = chess.Move.from_uci(rec.uci)
+                except Exception:
+                    mv = None
+            if mv is not None and board.is_legal(mv):
+                board.push(mv)
+        return prompts
+
     def dump_conversation_json(self, pending_prompt: dict | None = None):
-        path = self.cfg.conversation_log_path
+        path = self._conv_file_path
         if not path:
             return
         try:
-            dir_path = os.path.dirname(path)
-            if dir_path:
-                os.makedirs(dir_path, exist_ok=True)
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(self.export_conversation(pending_prompt=pending_prompt), f, ensure_ascii=False, indent=2)
+            _write_atomic(path, _dumps_json(self.export_conversation(pending_prompt=pending_prompt)))
             self.log.info("Wrote conversation log to %s", path)
         except Exception:
             self.log.exception("Failed writing conversation log")
 
+    def _stream_event(self, event: str, payload: dict | PlyRecord):
+        """Append one compact JSON line to the per-game NDJSON stream (no-op when streaming is off)."""
+        fp = self._conv_ndjson_fp
+        if not fp:
+            return
+        try:
+            line = {"event": event, "ply": len(self.records) + (1 if event == "pending_prompt" else 0)}
+            line.update(payload.to_dict() if isinstance(payload, PlyRecord) else payload)
+            fp.write(_dumps_line(line))
+        except Exception:
+            self.log.exception("Failed streaming %s to conversation log", event)
+
+    def _checkpoint_logs(self):
+        """Periodically rewrite the full JSON logs; per-ply durability comes from the NDJSON stream."""
+        if not self.records:
+            return
+        k = self.cfg.full_dump_every_k_plies
+        if k > 0 and len(self.records) % k == 0:
+            self.dump_conversation_json()
+            self.dump_structured_history_json()
+        elif self.cfg.history_dump_every_turn:
+            self.dump_structured_history_json()
+
+    def _write_final_logs(self):
+        """Emit full conversation/history JSON once and close the per-ply stream."""
+        self.dump_conversation_json()
+        self.dump_structured_history_json()
+        self.close()
+
+    def close(self):
+        fp, self._conv_ndjson_fp = self._conv_ndjson_fp, None
+        if fp:
+            try:
+                fp.close()
+            except Exception:
+                self.log.exception("Failed closing conversation stream")
+
     def verify_history_result(self) -> dict:
-        """Rebuild board from recorded moves to cross-check final status.
+        """Replay recorded moves (incrementally) to cross-check final status.
         Returns dict with keys: reconstructed_result, referee_result, mismatch(bool)
         """
-        board = chess.Board()
-        for rec in self.records:
-            uci = rec.get("uci")
-            if not uci:
-                continue
-            try:
-                mv = chess.Move.from_uci(uci)
-            except Exception:
-                return {"error": f"bad_uci_in_history:{uci}"}
-            if mv in board.legal_moves:
-                board.push(mv)
-            else:
-                return {"error": f"illegal_sequence_at:{uci}"}
+        # Shares the incrementally replayed board used for structured history export
+        self._advance_structured_moves()
+        if self._verify_error:
+            return {"error": self._verify_error}
+        board = self._struct_board
         reconstructed = board.result() if board.is_game_over() else "*"
         referee_res = self.ref.status()
         return {"reconstructed_result": reconstructed, "referee_result": referee_res, "mismatch": reconstructed != referee_res}
@@ -443,71 +655,79 @@ class GameRunner:
     # ---------------- Finalization for orchestrated runs -----------------
     def finalize_if_terminated(self):
         """Ensure referee result is set when termination conditions are met in orchestrated mode.
-        Also enforce max_plies.
+        Also enforce max_plies. Writes the full conversation/history logs once the game has ended.
         """
+        if self._apply_termination():
+            self._write_final_logs()
+
+    def _apply_termination(self) -> bool:
         # If already has a result, ensure termination_reason at least set to normal
         if self.ref.status() != "*":
             if not self.termination_reason:
                 self.termination_reason = "normal_game_end"
             self.ref.set_result(self.ref.status(), self.termination_reason)
-            return
+            return True
         # Illegal LLM threshold => LLM loses
         if self.termination_reason == "illegal_llm_move":
             result = "0-1" if self._is_white else "1-0"
             self.ref.force_result(result, self.termination_reason)
-            return
+            return True
         if self.termination_reason == "illegal_opponent_move":
             result = "1-0" if self._is_white else "0-1"
             self.ref.force_result(result, self.termination_reason)
-            return
+            return True
         # Max plies
         if len(self.records) >= self.cfg.max_plies:
             self.termination_reason = self.termination_reason or "max_plies_reached"
             self.ref.set_result("1/2-1/2", self.termination_reason)
-            return
+            return True
+        return False
 
     def play(self) -> str:
         ply = 0
-        while self.ref.status() == "*" and ply < self.cfg.max_plies:
-            if self._cancelled():
-                self.termination_reason = self.termination_reason or "cancelled"
-                break
-            llm_turn_now = (self.ref.board.turn == chess.WHITE and self._is_white) or (self.ref.board.turn == chess.BLACK and not self._is_white)
-            if llm_turn_now:
-                ok, uci, san, ms, meta = self._llm_turn_standard()
-                self.records.append({"actor": "LLM", "uci": uci, "ok": ok, "ms": ms, "san": san, "meta": meta})
-                self.log.debug("Ply %d LLM move %s ok=%s san=%s ms=%d", ply+1, uci, ok, san, ms)
-                # Save after each LLM move if enabled
-                if self.cfg.conversation_log_path and self.cfg.conversation_log_every_turn:
-                    self.dump_conversation_json()
-                    self.dump_structured_history_json()
-                if not ok:
-                    if self._cancelled():
-                        self.termination_reason = self.termination_reason or "cancelled"
-                        break
-                    self.termination_reason = "illegal_llm_move"
-                    result = "0-1" if self._is_white else "1-0"
-                    self.ref.force_result(result, self.termination_reason)
-                    self.log.error("Terminating due to illegal LLM move at ply %d", ply+1)
+        try:
+            while self.ref.status() == "*" and ply < self.cfg.max_plies:
+                if self._cancelled():
+                    self.termination_reason = self.termination_reason or "cancelled"
                     break
-            else:
-                ok, uci, san, meta = self._opp_turn()
-                ms = meta.get("latency_ms") if meta else None
-                self.records.append({"actor": "OPP", "uci": uci, "ok": ok, "ms": ms, "san": san, "meta": meta})
-                self.log.debug("Ply %d OPP move %s san=%s", ply+1, uci, san)
-                if not ok and not self.termination_reason:
-                    if self._cancelled():
-                        self.termination_reason = self.termination_reason or "cancelled"
+                llm_turn_now = (self.ref.board.turn == chess.WHITE and self._is_white) or (self.ref.board.turn == chess.BLACK and not self._is_white)
+                if llm_turn_now:
+                    ok, uci, san, ms, meta = self._llm_turn_standard()
+                    self.append_record(PlyRecord(actor="LLM", uci=uci, ok=ok, san=san, ms=ms, meta=meta))
+                    self.log.debug("Ply %d LLM move %s ok=%s san=%s ms=%d", ply+1, uci, ok, san, ms)
+                    # Save after each LLM move if enabled
+                    self._stream_event("ply", self.records[-1])
+                    self._checkpoint_logs()
+                    if not ok:
+                        if self._cancelled():
+                            self.termination_reason = self.termination_reason or "cancelled"
+                            break
+                        self.termination_reason = "illegal_llm_move"
+                        result = "0-1" if self._is_white else "1-0"
+                        self.ref.force_result(result, self.termination_reason)
+                        self.log.error("Terminating due to illegal LLM move at ply %d", ply+1)
                         break
-                    self.termination_reason = "illegal_opponent_move"
-                    result = "1-0" if self._is_white else "0-1"
-                    self.ref.force_result(result, self.termination_reason)
-                    break
-                # Save after each OPP move if enabled
-                if self.cfg.conversation_log_path and self.cfg.conversation_log_every_turn:
-                    self.dump_conversation_json()
-                    self.dump_structured_history_json()
-            ply += 1
+                else:
+                    ok, uci, san, meta = self._opp_turn()
+                    ms = meta.get("latency_ms") if meta else None
+                    self.append_record(PlyRecord(actor="OPP", uci=uci, ok=ok, san=san, ms=ms, meta=meta))
+                    self.log.debug("Ply %d OPP move %s san=%s", ply+1, uci, san)
+                    if not ok and not self.termination_reason:
+                        if self._cancelled():
+                            self.termination_reason = self.termination_reason or "cancelled"
+                            break
+                        self.termination_reason = "illegal_opponent_move"
+                        result = "1-0" if self._is_white else "0-1"
+                        self.ref.force_result(result, self.termination_reason)
+                        break
+                    # Save after each OPP move if enabled
+                    self._stream_event("ply", self.records[-1])
+                    self._checkpoint_logs()
+                ply += 1
+        except BaseException:
+            # Keep what was played so far: write the full logs and close the stream, then re-raise
+            self._write_final_logs()
+            raise
         result = self.ref.status()
         if self.termination_reason == "cancelled":
             result = self.ref.status() if self.ref.status() != "*" else "*"
@@ -527,33 +747,50 @@ class GameRunner:
             self.ref.set_result("1/2-1/2", self.termination_reason)  # declare draw by truncation
             result = "1/2-1/2"
         self.log.info("Game finished result=%s reason=%s plies=%d", result, self.termination_reason, ply)
-        self.dump_conversation_json()
-        self.dump_structured_history_json()
+        self._write_final_logs()
+        return result
+
+    async def aplay(self) -> str:
+        """Async counterpart of play() built on astep_llm/astep_opponent; see play_many."""
+        try:
+            while self.ref.status() == "*" and len(self.records) < self.cfg.max_plies:
+                if self._cancelled():
+                    self.termination_reason = self.termination_reason or "cancelled"
+                    break
+                if self.needs_llm_turn():
+                    await self.astep_llm()
+                else:
+                    await self.astep_opponent()
+        except BaseException:
+            self._write_final_logs()
+            raise
+        if self.termination_reason == "cancelled":
+            self.ref.set_result(self.ref.status(), self.termination_reason)
+            self._write_final_logs()
+        else:
+            self.finalize_if_terminated()
+        result = self.ref.status()
+        self.log.info("Game finished result=%s reason=%s plies=%d", result, self.termination_reason, len(self.records))
         return result
 
     # ---------------- Metrics -----------------
     def metrics(self) -> dict:
-        llm_moves = [r for r in self.records if r["actor"] == "LLM"]
-        opp_moves = [r for r in self.records if r["actor"] == "OPP"]
-        latencies = [r.get("ms", 0) for r in llm_moves if r.get("ms") is not None]
-        legal = [r for r in llm_moves if r.get("ok")]
-        illegal = [r for r in llm_moves if not r.get("ok")]
-        opp_illegal = [r for r in opp_moves if not r.get("ok")]
+        latencies = self._latencies
         return {
             "plies_total": len(self.records),
-            "plies_llm": len(llm_moves),
-            "llm_legal_moves": len(legal),
-            "llm_illegal_moves": len(illegal),
-            "llm_legal_rate": (len(legal) / len(llm_moves)) if llm_moves else 0.0,
-            "latency_ms_avg": statistics.mean(latencies) if latencies else 0,
-            "latency_ms_p95": statistics.quantiles(latencies, n=100)[94] if len(latencies) >= 20 else (max(latencies) if latencies else 0),
+            "plies_llm": self._llm_moves,
+            "llm_legal_moves": self._llm_legal,
+            "llm_illegal_moves": self._llm_illegal,
+            "llm_legal_rate": (self._llm_legal / self._llm_moves) if self._llm_moves else 0.0,
+            "latency_ms_avg": (self._latency_sum / len(latencies)) if latencies else 0,
+            "latency_ms_p95": _p95(latencies),
             "result": self.ref.status(),
             "termination_reason": self.termination_reason,
             "duration_s": round(time.time() - self.start_ts, 2),
             "opponent_type": self._opp_type(),
             "opponent_label": self._opp_name(),
             "opponent_model": getattr(self.opp, "model", None) if isinstance(self.opp, LLMOpponent) else None,
-            "opponent_illegal_moves": len(opp_illegal),
+            "opponent_illegal_moves": self._opp_illegal,
         }
 
     def summary(self) -> dict:
@@ -563,3 +800,10 @@ class GameRunner:
         # Also include a small preview of the structured history path if available
         m["structured_history_path"] = self._structured_history_path()
         return m
+
+
+async def play_many(runners: list[GameRunner]) -> list[str]:
+    """Play several games concurrently on one event loop so their LLM round-trips overlap.
+    Returns the final result of each runner, in order.
+    """
+    return list(await asyncio.gather(*(r.aplay() for r in runners)))
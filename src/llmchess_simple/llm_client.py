@@ -6,72 +6,346 @@ The rest of the code should not care which SDK is in use. This module talks to
 the Gateway with `model` + `messages` and returns raw text responses.
 """
 from typing import Optional, List, Dict
+import asyncio
+import concurrent.futures
+import hashlib
+import json
 import logging
 import random
+import threading
 import time
+import weakref
+from functools import lru_cache
 
-from openai import OpenAI
+import httpx
+from openai import (
+    APIConnectionError,
+    APIStatusError,
+    APITimeoutError,
+    AsyncOpenAI,
+    DefaultAsyncHttpxClient,
+    DefaultHttpxClient,
+    OpenAI,
+    RateLimitError,
+)
 
 from .config import SETTINGS
+from .move_validator import Notation, parse_expected_move
 
 log = logging.getLogger("llm_client")
 
 SYSTEM = "You are a strong chess player. When asked for a move, decide the best move."
 
 
-_CLIENT = OpenAI(api_key=SETTINGS.llm_api_key or None, base_url=SETTINGS.api_base or None)
+# One shared connection pool per client, sized for LLMCHESS_MAX_CONCURRENCY; fail fast on connect/pool waits
+_HTTP_LIMITS = httpx.Limits(
+    max_connections=max(100, SETTINGS.max_concurrency * 2),
+    max_keepalive_connections=max(20, SETTINGS.max_concurrency),
+)
+_HTTP_TIMEOUT = httpx.Timeout(SETTINGS.responses_timeout_s, connect=5.0, write=10.0, pool=5.0)
+
+
+# Clients are created on first use so importing game/opponent modules stays cheap (and works without a key)
+@lru_cache(maxsize=1)
+def _client() -> OpenAI:
+    return OpenAI(
+        api_key=SETTINGS.llm_api_key or None,
+        base_url=SETTINGS.api_base or None,
+        http_client=DefaultHttpxClient(limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT),
+    )
+
+
+@lru_cache(maxsize=1)
+def _aclient() -> AsyncOpenAI:
+    return AsyncOpenAI(
+        api_key=SETTINGS.llm_api_key or None,
+        base_url=SETTINGS.api_base or None,
+        http_client=DefaultAsyncHttpxClient(limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT),
+    )
+
+
+_ASEMS: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = weakref.WeakKeyDictionary()
+_ASEMS_LOCK = threading.Lock()
+
+
+def _async_sem() -> asyncio.Semaphore:
+    """Cap (LLMCHESS_MAX_CONCURRENCY) on in-flight async requests per event loop.
+
+    Each running loop keeps its own semaphore for its lifetime; loops in different
+    threads are capped independently.
+    """
+    loop = asyncio.get_running_loop()
+    with _ASEMS_LOCK:
+        sem = _ASEMS.get(loop)
+        if sem is None:
+            sem = _ASEMS[loop] = asyncio.Semaphore(max(1, SETTINGS.max_concurrency))
+    return sem
+
+
+class _RateLimiter:
+    """Shared request/token bucket (per minute). reserve() books a call and returns how long to wait first."""
+
+    def __init__(self, rpm: int, tpm: int):
+        self.rpm = max(0, rpm)
+        self.tpm = max(0, tpm)
+        self._requests = float(self.rpm)
+        self._tokens = float(self.tpm)
+        self._t = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: int) -> float:
+        if not self.rpm and not self.tpm:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            elapsed, self._t = now - self._t, now
+            wait = 0.0
+            if self.rpm:
+                self._requests = min(self.rpm, self._requests + elapsed * self.rpm / 60.0) - 1
+                if self._requests < 0:
+                    wait = max(wait, -self._requests * 60.0 / self.rpm)
+            if self.tpm:
+                self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60.0) - tokens
+                if self._tokens < 0:
+                    wait = max(wait, -self._tokens * 60.0 / self.tpm)
+            return wait
+
+
+_RATE = _RateLimiter(SETTINGS.requests_per_minute, SETTINGS.tokens_per_minute)
+
+
+def _estimate_tokens(messages: List[Dict[str, str]]) -> int:
+    # Rough chars/4 estimate; only used to pace requests against LLMCHESS_TOKENS_PER_MINUTE
+    return sum(len(m.get("content") or "") for m in messages) // 4 + 1
+
+
+_BACKOFF_BASE_S = 1.0
+_BACKOFF_CAP_S = 60.0
+
+
+def _retry_after_s(exc: Exception) -> float | None:
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        value = float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+    return min(max(value, 0.0), _BACKOFF_CAP_S)
+
+
+def _retry_delay_s(exc: Exception, attempt: int) -> float | None:
+    """Seconds to wait before retrying after exc, or None when the error is not retryable.
+    Honors Retry-After on 429s; otherwise full-jitter exponential backoff capped at 60s.
+    """
+    if isinstance(exc, RateLimitError):
+        retry_after = _retry_after_s(exc)
+        if retry_after is not None:
+            return retry_after
+    elif isinstance(exc, APIStatusError) and exc.status_code < 500 and exc.status_code not in (408, 409):
+        return None  # bad request/auth/not found: retrying will not help
+    elif not isinstance(exc, (APITimeoutError, APIConnectionError, APIStatusError)):
+        log.debug("Retrying after unexpected %s", type(exc).__name__)
+    return random.uniform(0, min(_BACKOFF_CAP_S, _BACKOFF_BASE_S * (2 ** attempt)))
+
+
+def _create_kwargs(model: str, messages: List[Dict[str, str]], timeout: float) -> dict:
+    kwargs = {"model": model, "messages": messages, "timeout": timeout}
+    if SETTINGS.prompt_cache_key and messages and messages[0].get("role") == "system":
+        # Same system text -> same key, so the provider routes turns to a warm prefix cache
+        key = hashlib.blake2b(f"{model}\n{messages[0].get('content') or ''}".encode("utf-8"), digest_size=16).hexdigest()
+        kwargs["extra_body"] = {"prompt_cache_key": key}
+    return kwargs
+
+
+def _move_decoded(text: str, fen: str, expected_notation: Notation) -> bool:
+    """True once the streamed prefix already settles the move the validator will read.
+    The validator only looks at the first token (first line for FEN), so once that is
+    complete and legal the rest of the reply cannot change the outcome.
+    """
+    text = text.lstrip()
+    if not text or text.startswith("```"):
+        return False  # fenced replies are only unwrapped once the closing fence arrives
+    if expected_notation == "fen":
+        if "\n" not in text:
+            return False
+    elif not any(ch.isspace() for ch in text):
+        return False
+    return bool(parse_expected_move(text, fen, expected_notation).get("ok"))
+
+
+def _delta_text(chunk) -> str:
+    if not chunk.choices:
+        return ""
+    return getattr(chunk.choices[0].delta, "content", None) or ""
+
+
+# Identical requests currently in flight (LLMCHESS_COALESCE_REQUESTS): later callers share the first one's reply
+_INFLIGHT: dict[str, concurrent.futures.Future] = {}
+_INFLIGHT_LOCK = threading.Lock()
+_AINFLIGHT: dict[tuple[int, str], asyncio.Task] = {}
+
+
+def _request_key(messages, model, fen, expected_notation) -> str:
+    payload = json.dumps([model, messages, fen, expected_notation], sort_keys=True, ensure_ascii=False)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
 
 
 # ------------------------- Chat wrappers -------------------------
-def ask_for_best_move_conversation(messages: List[Dict[str, str]], model: Optional[str] = None) -> str:
-    """Given a chat-style conversation (including system message), request the next move."""
+def ask_for_best_move_conversation(
+    messages: List[Dict[str, str]],
+    model: Optional[str] = None,
+    fen: Optional[str] = None,
+    expected_notation: Notation = "san",
+    timeout: Optional[float] = None,
+) -> str:
+    """Given a chat-style conversation (including system message), request the next move.
+    With fen set and LLMCHESS_STREAM_EARLY_STOP on, the reply is streamed and cut off once a legal move is decodable.
+    timeout overrides LLMCHESS_RESPONSES_TIMEOUT_S for this call (e.g. shorter for interactive play).
+    """
     if not model:
         raise ValueError("Model is required; set it in your JSON config (key 'model') or CLI.")
-    delay = 0.5
-    timeout = SETTINGS.responses_timeout_s
+    timeout = timeout or SETTINGS.responses_timeout_s
+    if not SETTINGS.coalesce_requests:
+        return _ask_with_retries(messages, model, fen, expected_notation, timeout)
+    key = _request_key(messages, model, fen, expected_notation)
+    with _INFLIGHT_LOCK:
+        fut = _INFLIGHT.get(key)
+        owner = fut is None
+        if owner:
+            fut = _INFLIGHT[key] = concurrent.futures.Future()
+    if not owner:
+        return fut.result()
+    try:
+        text = _ask_with_retries(messages, model, fen, expected_notation, timeout)
+        fut.set_result(text)
+        return text
+    except BaseException as exc:
+        fut.set_exception(exc)
+        raise
+    finally:
+        with _INFLIGHT_LOCK:
+            _INFLIGHT.pop(key, None)
+
+
+def _ask_with_retries(messages, model, fen, expected_notation, timeout) -> str:
+    est_tokens = _estimate_tokens(messages)
+    stream = bool(fen) and SETTINGS.stream_early_stop
+    kwargs = _create_kwargs(model, messages, timeout)  # built once, reused by every attempt
     for attempt in range(SETTINGS.responses_retries + 1):
+        wait = _RATE.reserve(est_tokens)
+        if wait > 0:
+            time.sleep(wait)
         try:
-            rsp = _CLIENT.chat.completions.create(
-                model=model,
-                messages=messages,
-                timeout=timeout,
-            )
-            text = _extract_text(rsp)
+            if stream:
+                text = _stream_until_move(kwargs, fen, expected_notation)
+            else:
+                rsp = _client().chat.completions.create(**kwargs)
+                text = _extract_text(rsp)
             if text:
                 return text.strip()
-        except Exception:
-            if attempt >= SETTINGS.responses_retries:
+        except Exception as exc:
+            delay = _retry_delay_s(exc, attempt)
+            if delay is None or attempt >= SETTINGS.responses_retries:
                 log.exception("Chat request failed after %d attempts", attempt + 1)
                 break
-            sleep_s = delay * (2 ** attempt) * (0.8 + 0.4 * random.random())
-            time.sleep(min(sleep_s, 10.0))
+            time.sleep(delay)
     return ""
 
 
-# Convenience wrappers retained for compatibility (plaintext/FEN prompts constructed elsewhere)
-def ask_for_best_move_plain(side: str, history_text: str = "", model: Optional[str] = None) -> str:
-    messages = [
-        {"role": "system", "content": SYSTEM},
-        {"role": "user", "content": f"Side to move: {side}\nMove history:\n{history_text or '(none)'}\nRespond with the best legal chess move."},
-    ]
-    return ask_for_best_move_conversation(messages, model=model)
+def _stream_until_move(kwargs, fen, expected_notation) -> str:
+    parts: list[str] = []
+    stream = _client().chat.completions.create(stream=True, **kwargs)
+    try:
+        for chunk in stream:
+            delta = _delta_text(chunk)
+            if not delta:
+                continue
+            parts.append(delta)
+            if any(ch.isspace() for ch in delta) and _move_decoded("".join(parts), fen, expected_notation):
+                break
+    finally:
+        stream.close()
+    return "".join(parts)
+
+
+async def ask_for_best_move_conversation_async(
+    messages: List[Dict[str, str]],
+    model: Optional[str] = None,
+    fen: Optional[str] = None,
+    expected_notation: Notation = "san",
+    timeout: Optional[float] = None,
+) -> str:
+    """Async variant of ask_for_best_move_conversation; lets many games await replies on one event loop."""
+    if not model:
+        raise ValueError("Model is required; set it in your JSON config (key 'model') or CLI.")
+    timeout = timeout or SETTINGS.responses_timeout_s
+    if not SETTINGS.coalesce_requests:
+        return await _aask_with_retries(messages, model, fen, expected_notation, timeout)
+    loop = asyncio.get_running_loop()
+    key = (id(loop), _request_key(messages, model, fen, expected_notation))
+    task = _AINFLIGHT.get(key)
+    if task is None:
+        task = _AINFLIGHT[key] = loop.create_task(_aask_with_retries(messages, model, fen, expected_notation, timeout))
+        task.add_done_callback(lambda _t: _AINFLIGHT.pop(key, None))
+    # shield: one waiter being cancelled must not cancel the shared request for the others
+    return await asyncio.shield(task)
+
+
+async def _aask_with_retries(messages, model, fen, expected_notation, timeout) -> str:
+    est_tokens = _estimate_tokens(messages)
+    stream = bool(fen) and SETTINGS.stream_early_stop
+    kwargs = _create_kwargs(model, messages, timeout)  # built once, reused by every attempt
+    for attempt in range(SETTINGS.responses_retries + 1):
+        wait = _RATE.reserve(est_tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        try:
+            async with _async_sem():
+                if stream:
+                    text = await _astream_until_move(kwargs, fen, expected_notation)
+                else:
+                    rsp = await _aclient().chat.completions.create(**kwargs)
+                    text = _extract_text(rsp)
+            if text:
+                return text.strip()
+        except Exception as exc:
+            delay = _retry_delay_s(exc, attempt)
+            if delay is None or attempt >= SETTINGS.responses_retries:
+                log.exception("Chat request failed after %d attempts", attempt + 1)
+                break
+            await asyncio.sleep(delay)
+    return ""
 
 
-def ask_for_best_move_raw(fen: str, pgn_tail: str = "", side: str = "", model: Optional[str] = None) -> str:
-    parts = [f"Position (FEN): {fen}"]
-    if side:
-        parts.append(f"Side to move: {side}")
-    if pgn_tail:
-        parts.append(f"Recent moves (PGN tail):\n{pgn_tail}")
-    parts.append("Respond with the best chess move.")
-    messages = [
-        {"role": "system", "content": SYSTEM},
-        {"role": "user", "content": "\n".join(parts)},
-    ]
-    return ask_for_best_move_conversation(messages, model=model)
+async def _astream_until_move(kwargs, fen, expected_notation) -> str:
+    parts: list[str] = []
+    stream = await _aclient().chat.completions.create(stream=True, **kwargs)
+    try:
+        async for chunk in stream:
+            delta = _delta_text(chunk)
+            if not delta:
+                continue
+            parts.append(delta)
+            if any(ch.isspace() for ch in delta) and _move_decoded("".join(parts), fen, expected_notation):
+                break
+    finally:
+        await stream.close()
+    return "".join(parts)
 
 
 def _extract_text(rsp) -> str:
+    # Fast path: plain string content, which is what nearly every chat completion returns
+    choices = getattr(rsp, "choices", None)
+    if choices:
+        content = getattr(getattr(choices[0], "message", None), "content", None)
+        if type(content) is str:
+            return content
+    return _extract_text_slow(rsp)
+
+
+def _extract_text_slow(rsp) -> str:
     try:
         if hasattr(rsp, "choices") and rsp.choices:
             msg = rsp.choices[0].message
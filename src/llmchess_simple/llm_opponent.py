@@ -1,13 +1,13 @@
 from __future__ import annotations
 """LLM-backed opponent for model-vs-model evaluation."""
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional
 
 import chess
 
-from .llm_client import ask_for_best_move_conversation
-from .llm_play import build_prompt_messages_for_board, process_llm_raw_move
+from .llm_client import ask_for_best_move_conversation, ask_for_best_move_conversation_async
+from .llm_play import HistoryCache, build_prompt_messages_for_board, process_llm_raw_move
 from .prompting import PromptConfig
 
 
@@ -16,6 +16,9 @@ class LLMOpponent:
     model: str
     prompt_cfg: Optional[PromptConfig] = None
     name: Optional[str] = None
+    timeout_s: Optional[float] = None  # per-request timeout; None uses LLMCHESS_RESPONSES_TIMEOUT_S
+    # Fallback replay state when the caller does not share its game's HistoryCache
+    _history: HistoryCache = field(default_factory=HistoryCache, init=False, repr=False, compare=False)
 
     def label(self) -> str:
         return self.name or self.model
@@ -28,8 +31,31 @@ class LLMOpponent:
         log: logging.Logger,
         prompt_cfg: Optional[PromptConfig] = None,
         on_prompt: Optional[callable] = None,
+        history_cache: Optional[HistoryCache] = None,
     ):
         """Generate a move using the configured LLM and apply it via the provided callback."""
+        fen = board.fen()
+        cfg, messages = self._prepare_messages(board, fen, pgn_tail_plies, prompt_cfg, on_prompt, history_cache)
+        raw = ask_for_best_move_conversation(messages, model=self.model, fen=fen, expected_notation=getattr(cfg, "expected_notation", "san"), timeout=self.timeout_s)
+        return self._apply_reply(raw, board, cfg, messages, apply_uci_fn, log)
+
+    async def achoose_llm(
+        self,
+        board: chess.Board,
+        apply_uci_fn,
+        pgn_tail_plies: int,
+        log: logging.Logger,
+        prompt_cfg: Optional[PromptConfig] = None,
+        on_prompt: Optional[callable] = None,
+        history_cache: Optional[HistoryCache] = None,
+    ):
+        """Async counterpart of choose_llm; awaits the model reply instead of blocking."""
+        fen = board.fen()
+        cfg, messages = self._prepare_messages(board, fen, pgn_tail_plies, prompt_cfg, on_prompt, history_cache)
+        raw = await ask_for_best_move_conversation_async(messages, model=self.model, fen=fen, expected_notation=getattr(cfg, "expected_notation", "san"), timeout=self.timeout_s)
+        return self._apply_reply(raw, board, cfg, messages, apply_uci_fn, log)
+
+    def _prepare_messages(self, board, fen, pgn_tail_plies, prompt_cfg, on_prompt, history_cache):
         cfg = prompt_cfg or self.prompt_cfg or PromptConfig()
         side = "white" if board.turn == chess.WHITE else "black"
         is_starting = side == "white" and len(board.move_stack) == 0
@@ -39,6 +65,8 @@ class LLMOpponent:
             prompt_cfg=cfg,
             pgn_tail_plies=pgn_tail_plies,
             is_starting=is_starting,
+            history_cache=history_cache or self._history,
+            fen=fen,
         )
         if on_prompt:
             on_prompt({
@@ -46,7 +74,9 @@ class LLMOpponent:
                 "prompt": messages[-1]["content"] if messages else "",
                 "model": self.model,
             })
-        raw = ask_for_best_move_conversation(messages, model=self.model)
+        return cfg, messages
+
+    def _apply_reply(self, raw, board, cfg, messages, apply_uci_fn, log):
         meta_extra = {
             "mode": "opponent_llm",
             "prompt": messages[-1]["content"] if messages else "",
@@ -56,7 +86,7 @@ class LLMOpponent:
         }
         ok, uci, san, ms, meta, _ = process_llm_raw_move(
             raw,
-            board.fen(),
+            board,
             apply_uci_fn=apply_uci_fn,
             log=log,
             meta_extra=meta_extra,
@@ -12,53 +12,111 @@ from typing import Callable
 import chess
 
 from .move_validator import parse_expected_move, Notation
-from .prompting import PromptConfig, render_custom_prompt
+from .prompting import PromptConfig, compile_template, render_compiled
+
+
+_PIECE_NAMES = {pt: chess.piece_name(pt).capitalize() for pt in chess.PIECE_TYPES}
+_COLOR_NAMES = ("Black", "White")  # indexed by board.turn (chess.BLACK == False)
+
+
+class HistoryCache:
+    """Incrementally maintained move history for one game.
+
+    Replays only the moves pushed since the previous call, so per-turn prompt
+    builds do not re-run SAN generation over the whole game.
+    """
+
+    def __init__(self):
+        self.board = chess.Board()
+        self.lines: list[str] = []  # annotated lines: 'White Pawn e4'
+        self.pgn_tokens: list[str] = []  # SAN tokens with move numbers on White's moves
+        self.ply = 0
+        self._source: chess.Board | None = None  # board last advanced from
+
+    def advance(self, board: chess.Board) -> None:
+        """Catch up with board.move_stack; resets if the stack no longer extends the cached one."""
+        stack = board.move_stack
+        if len(stack) < self.ply or (self.ply and stack[self.ply - 1] != self.board.peek()):
+            self.__init__()
+        elif self.ply and board is not self._source and stack[:self.ply] != self.board.move_stack:
+            # A different game (e.g. one opponent reused across games) may share the last move
+            # through a transposition, so check the whole cached prefix before reusing it
+            self.__init__()
+        self._source = board
+        replay = self.board
+        for mv in stack[self.ply:]:
+            piece = replay.piece_at(mv.from_square)
+            san = replay.san(mv)
+            piece_name = _PIECE_NAMES[piece.piece_type] if piece else "Piece"
+            self.lines.append(f"{_COLOR_NAMES[replay.turn]} {piece_name} {san}")
+            if self.ply % 2 == 0:  # white move, include move number
+                self.pgn_tokens.append(f"{(self.ply // 2) + 1}. {san}")
+            else:
+                self.pgn_tokens.append(san)
+            replay.push(mv)
+            self.ply += 1
+
+    def annotated_history(self) -> str:
+        return "\n".join(self.lines)
+
+    def pgn_tail(self, max_plies: int) -> str:
+        if max_plies <= 0:
+            return ""
+        return " ".join(self.pgn_tokens[-max_plies:])
 
 
 def annotated_history_from_board(board: chess.Board) -> str:
     """Return history as one move per line: 'White Pawn e4' / 'Black Knight f6'. No numbering."""
-    lines: list[str] = []
-    replay = chess.Board()
-    for mv in board.move_stack:
-        piece = replay.piece_at(mv.from_square)
-        san = replay.san(mv)
-        color = "White" if replay.turn == chess.WHITE else "Black"
-        piece_name = chess.piece_name(piece.piece_type).capitalize() if piece else "Piece"
-        lines.append(f"{color} {piece_name} {san}")
-        replay.push(mv)
-    return "\n".join(lines)
+    cache = HistoryCache()
+    cache.advance(board)
+    return cache.annotated_history()
 
 
 def pgn_tail_from_board(board: chess.Board, max_plies: int) -> str:
     """Produce a clean SAN move list without headers, truncated to the last max_plies."""
     if max_plies <= 0:
         return ""
-    replay = chess.Board()  # start pos
-    sans: list[str] = []
-    for idx, mv in enumerate(board.move_stack):
-        san = replay.san(mv)
-        replay.push(mv)
-        move_no = (idx // 2) + 1
-        if idx % 2 == 0:  # white move, include move number
-            sans.append(f"{move_no}. {san}")
+    # One-shot conversion for callers without a HistoryCache: "1. e4 e5 2. Nf3" -> per-ply tokens
+    tokens: list[str] = []
+    for part in chess.Board().variation_san(board.move_stack).split():
+        if tokens and tokens[-1].endswith("."):
+            tokens[-1] = f"{tokens[-1]} {part}"
         else:
-            sans.append(san)
-    tail = sans[-max_plies:]
-    return " ".join(tail)
-
-
-def build_prompt_messages_for_board(board: chess.Board, side: str, prompt_cfg: PromptConfig, pgn_tail_plies: int, is_starting: bool) -> list[dict]:
-    """Construct prompt messages for the given board/side using the configured template."""
-    history = annotated_history_from_board(board)
-    fen = board.fen()
-    san_history = pgn_tail_from_board(board, pgn_tail_plies) or "(none)"
-    values = {
-        "SIDE_TO_MOVE": side,
-        "FEN": fen,
-        "SAN_HISTORY": san_history,
-        "PLAINTEXT_HISTORY": history or "(none)",
-    }
-    user_content = render_custom_prompt(prompt_cfg.template, values)
+            tokens.append(part)
+    return " ".join(tokens[-max_plies:])
+
+
+def build_prompt_messages_for_board(
+    board: chess.Board,
+    side: str,
+    prompt_cfg: PromptConfig,
+    pgn_tail_plies: int,
+    is_starting: bool,
+    history_cache: HistoryCache | None = None,
+    fen: str | None = None,
+) -> list[dict]:
+    """Construct prompt messages for the given board/side using the configured template.
+
+    Pass a per-game history_cache to avoid replaying the full move stack every turn,
+    and the board's fen when the caller already computed it.
+    """
+    compiled = compile_template(prompt_cfg.template or "")
+    keys = compiled[1]
+    values = {"SIDE_TO_MOVE": side}
+    if "FEN" in keys:
+        values["FEN"] = fen if fen is not None else board.fen()
+    # Only replay history when the template actually uses it (e.g. FEN-only prompts skip it)
+    wants_san = "SAN_HISTORY" in keys
+    wants_plain = "PLAINTEXT_HISTORY" in keys
+    if wants_san or wants_plain:
+        if history_cache is None:
+            history_cache = HistoryCache()
+        history_cache.advance(board)
+        if wants_san:
+            values["SAN_HISTORY"] = history_cache.pgn_tail(pgn_tail_plies) or "(none)"
+        if wants_plain:
+            values["PLAINTEXT_HISTORY"] = history_cache.annotated_history() or "(none)"
+    user_content = render_compiled(compiled, values)
     # Optionally add starting context if desired and it's the first move
     # if is_starting and prompt_cfg.starting_context_enabled and side.lower() == "white":
     #     user_content = "Game start. You are White. Make the first move of the game.\n" + user_content
@@ -71,21 +129,23 @@ def build_prompt_messages_for_board(board: chess.Board, side: str, prompt_cfg: P
 def _strip_code_fence(raw: str) -> str:
     raw = raw.strip()
     if raw.startswith("```") and raw.endswith("```"):
-        inner = raw.split("\n", 1)
-        if len(inner) == 2:
-            return inner[1].rsplit("\n", 1)[0].strip()
+        start = raw.find("\n")
+        if start != -1:
+            end = raw.rfind("\n")
+            return (raw[start + 1:end] if end > start else raw[start + 1:]).strip()
     return raw
 
 
 def process_llm_raw_move(
     raw: str,
-    fen: str,
+    position: str | chess.Board,
     apply_uci_fn: Callable[[str], tuple[bool, str | None]],
     log: logging.Logger,
     meta_extra: dict | None = None,
     expected_notation: Notation = "san",
 ):
     """Normalize, validate, and apply an LLM move reply against the current board.
+    position is the live board (preferred, avoids a FEN round-trip) or its FEN.
 
     Returns (ok, uci, san, parse_ms, meta, salvage_used) -- salvage_used always False.
     """
@@ -93,7 +153,7 @@ def process_llm_raw_move(
     cleaned = _strip_code_fence(raw)
     parse_ms = int((time.time() - t0) * 1000)
 
-    validator_info = parse_expected_move(cleaned, fen, expected_notation)
+    validator_info = parse_expected_move(cleaned, position, expected_notation)
     ok = False
     san = None
     uci = ""
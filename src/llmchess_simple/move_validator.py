@@ -11,11 +11,19 @@ from __future__ import annotations
 
 import chess
 import re
+import sys
 from functools import lru_cache
 from typing import Literal, TypedDict
 
-UCI_RE = re.compile(r"^[a-h][1-8][a-h][1-8][qrbn]?$", re.I)
+UCI_RE = re.compile(r"[a-h][1-8][a-h][1-8][qrbn]?", re.I | re.A)  # use fullmatch (anchors implied)
 CASTLE_ZERO = {"0-0": "O-O", "0-0-0": "O-O-O", "o-o": "O-O", "o-o-o": "O-O-O"}
+# Castling written as 0-0/o-o, mapped straight to king-move UCI per side to move
+_CASTLE_UCI = {
+    (chess.WHITE, "0-0"): "e1g1", (chess.WHITE, "o-o"): "e1g1",
+    (chess.WHITE, "0-0-0"): "e1c1", (chess.WHITE, "o-o-o"): "e1c1",
+    (chess.BLACK, "0-0"): "e8g8", (chess.BLACK, "o-o"): "e8g8",
+    (chess.BLACK, "0-0-0"): "e8c8", (chess.BLACK, "o-o-o"): "e8c8",
+}
 
 Notation = Literal["san", "uci", "fen"]
 
@@ -23,7 +31,7 @@ Notation = Literal["san", "uci", "fen"]
 class ParsedMove(TypedDict, total=False):
     ok: bool
     uci: str
-    san: str
+    san: str  # omitted on the UCI path; use san_of()
     reason: str
     expected: str
 
@@ -32,9 +40,10 @@ def _strip_code_fence(text: str) -> str:
     """Remove simple ``` fences if present."""
     text = text.strip()
     if text.startswith("```") and text.endswith("```"):
-        inner = text.split("\n", 1)
-        if len(inner) == 2:
-            return inner[1].rsplit("\n", 1)[0].strip()
+        start = text.find("\n")
+        if start != -1:
+            end = text.rfind("\n")
+            return (text[start + 1:end] if end > start else text[start + 1:]).strip()
     return text
 
 
@@ -50,15 +59,41 @@ def _first_line(text: str) -> str:
 
 
 @lru_cache(maxsize=8192)
-def _legal_moves_set(fen: str) -> set[str]:
+def _board_template(fen: str) -> chess.Board:
+    """Parsed board per FEN. Shared: never mutate it, hand out _board_from_fen copies instead."""
+    return chess.Board(fen=fen)
+
+
+def _board_from_fen(fen: str) -> chess.Board:
+    # A stackless copy of the cached template is much cheaper than re-parsing the FEN
+    return _board_template(fen).copy(stack=False)
+
+
+_LEGAL_CACHE: dict[str, frozenset[str]] = {}
+_LEGAL_CACHE_MAX = 8192
+
+
+def _legal_key(fen: str) -> str:
+    # Board, side, castling and ep only: legal moves do not depend on the move clocks
+    return " ".join(fen.split(" ", 4)[:4])
+
+
+def _legal_moves_set(fen: str) -> frozenset[str]:
     """Cache and return the set of legal UCI moves for a given FEN."""
-    board = chess.Board(fen=fen)
-    return {m.uci() for m in board.legal_moves}
+    key = _legal_key(fen)
+    moves = _LEGAL_CACHE.get(key)
+    if moves is None:
+        # Interned so the same move string is shared across every cached position
+        moves = frozenset(sys.intern(m.uci()) for m in _board_from_fen(fen).legal_moves)
+        if len(_LEGAL_CACHE) >= _LEGAL_CACHE_MAX:
+            _LEGAL_CACHE.clear()
+        _LEGAL_CACHE[key] = moves
+    return moves
 
 
 def is_legal_uci(uci: str, fen: str) -> bool:
     """Fast legality check for a UCI move in a given FEN (no SAN computation)."""
-    if not UCI_RE.match(uci):
+    if not UCI_RE.fullmatch(uci):
         return False
     return uci.lower() in _legal_moves_set(fen)
 
@@ -78,26 +113,49 @@ def _boards_equivalent(a: chess.Board, b: chess.Board) -> bool:
         return False
     if a.ep_square is not None and b.ep_square is not None and a.ep_square != b.ep_square:
         return False
-    return a.piece_map() == b.piece_map()
+    # Compare bitboards directly rather than building two 64-square piece_map() dicts
+    return (
+        a.pawns == b.pawns
+        and a.knights == b.knights
+        and a.bishops == b.bishops
+        and a.rooks == b.rooks
+        and a.queens == b.queens
+        and a.kings == b.kings
+        and a.occupied_co[chess.WHITE] == b.occupied_co[chess.WHITE]
+        and a.occupied_co[chess.BLACK] == b.occupied_co[chess.BLACK]
+    )
 
 
 def _match_fen_to_move(candidate_board: chess.Board, board: chess.Board) -> ParsedMove:
-    """Find the legal move whose resulting board matches candidate_board (tolerant of clocks)."""
-    for mv in board.legal_moves:
-        tmp = board.copy()
-        tmp.push(mv)
-        if _boards_equivalent(tmp, candidate_board):
+    """Find the legal move whose resulting board matches candidate_board (tolerant of clocks).
+    board is left exactly as it was passed in.
+    """
+    if candidate_board.turn == board.turn:
+        return {"ok": False, "reason": "fen_not_match_legal_move"}  # any move flips the side to move
+    target_occ = candidate_board.occupied
+    for mv in list(board.legal_moves):  # materialized: the loop pushes/pops on board
+        # Cheap prefilter: the mover's origin must be empty and its destination occupied afterwards
+        if target_occ & chess.BB_SQUARES[mv.from_square] or not target_occ & chess.BB_SQUARES[mv.to_square]:
+            continue
+        # push/pop on the board itself instead of allocating a copy per candidate
+        board.push(mv)
+        try:
+            equal = _boards_equivalent(board, candidate_board)
+        finally:
+            board.pop()
+        if equal:
             return {"ok": True, "uci": mv.uci(), "san": board.san(mv)}
     return {"ok": False, "reason": "fen_not_match_legal_move"}
 
 
-def parse_expected_move(raw_text: str, fen: str, expected: Notation = "san") -> ParsedMove:
+def parse_expected_move(raw_text: str, fen: str | chess.Board, expected: Notation = "san") -> ParsedMove:
     """
     Parse a move using the requested notation. No cross-notation salvage.
+    fen may also be a live chess.Board (read only, never modified) to skip the FEN round-trip.
     Returns ParsedMove with ok/uci/san or a reason on failure.
     """
     expected = (expected or "san").lower()
-    board = chess.Board(fen=fen)
+    board = fen if isinstance(fen, chess.Board) else _board_from_fen(fen)
     token = _first_line(raw_text) if expected == "fen" else _primary_token(raw_text)
 
     if not token:
@@ -105,18 +163,17 @@ def parse_expected_move(raw_text: str, fen: str, expected: Notation = "san") ->
 
     if expected == "uci":
         token = token.lower()
-        if token in CASTLE_ZERO:
-            rank = "1" if board.turn == chess.WHITE else "8"
-            token = f"e{rank}g{rank}" if token in {"0-0", "o-o"} else f"e{rank}c{rank}"
+        token = _CASTLE_UCI.get((board.turn, token), token)
         if not UCI_RE.fullmatch(token):
             return {"ok": False, "reason": "bad_uci_format", "expected": expected}
         try:
             mv = chess.Move.from_uci(token)
         except Exception:
             return {"ok": False, "reason": "bad_uci_parse", "expected": expected}
-        if mv not in board.legal_moves:
+        if not board.is_legal(mv):
             return {"ok": False, "reason": "illegal_move", "expected": expected}
-        return {"ok": True, "uci": mv.uci(), "san": board.san(mv), "expected": expected}
+        # No SAN here: callers apply the UCI and get canonical SAN back from the referee (see san_of)
+        return {"ok": True, "uci": mv.uci(), "expected": expected}
 
     if expected == "fen":
         try:
@@ -135,12 +192,22 @@ def parse_expected_move(raw_text: str, fen: str, expected: Notation = "san") ->
         mv = board.parse_san(token)
     except Exception:
         return {"ok": False, "reason": "bad_san", "expected": expected}
-    if mv not in board.legal_moves:
+    if not board.is_legal(mv):
         return {"ok": False, "reason": "illegal_move", "expected": expected}
     return {"ok": True, "uci": mv.uci(), "san": board.san(mv), "expected": expected}
 
 
-def normalize_move(raw_text: str, fen: str, expected: Notation = "san") -> ParsedMove:
+def san_of(parsed: ParsedMove, fen: str | chess.Board) -> str | None:
+    """SAN for a successful ParsedMove, computed on demand when the parse did not include it."""
+    if not parsed.get("ok"):
+        return None
+    if parsed.get("san"):
+        return parsed["san"]
+    board = fen if isinstance(fen, chess.Board) else _board_from_fen(fen)
+    return board.san(chess.Move.from_uci(parsed["uci"]))
+
+
+def normalize_move(raw_text: str, fen: str | chess.Board, expected: Notation = "san") -> ParsedMove:
     """Backwards-compatible wrapper using explicit notation."""
     return parse_expected_move(raw_text, fen, expected)
 
@@ -148,6 +215,7 @@ def normalize_move(raw_text: str, fen: str, expected: Notation = "san") -> Parse
 __all__ = [
     "parse_expected_move",
     "normalize_move",
+    "san_of",
     "is_legal_uci",
     "legal_moves",
     "Notation",
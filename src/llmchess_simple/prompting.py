@@ -6,8 +6,10 @@ that are substituted per turn.
 """
 from __future__ import annotations
 
+import re
 from dataclasses import dataclass
-from typing import Dict
+from functools import lru_cache
+from typing import Dict, Tuple
 
 DEFAULT_SAN_SYSTEM = "You are a strong chess player. When asked for a move, provide only the best legal move in SAN."
 DEFAULT_SAN_TEMPLATE = """Position (FEN): {FEN}
@@ -29,18 +31,41 @@ DEFAULT_SYSTEM_INSTRUCTIONS = DEFAULT_SAN_SYSTEM
 DEFAULT_TEMPLATE = DEFAULT_SAN_TEMPLATE
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PromptConfig:
-    """Configuration for shaping move prompts using a custom template."""
+    """Configuration for shaping move prompts using a custom template.
+
+    Frozen: a config cannot be changed while a run is using it.
+    """
 
     system_instructions: str = DEFAULT_SAN_SYSTEM
     template: str = DEFAULT_SAN_TEMPLATE
     expected_notation: str = "san"  # "san" | "uci" | "fen"
 
 
+_PLACEHOLDER_RE = re.compile(r"\{(\w+)\}")
+
+# (literal segments, placeholder keys): literals[0] key[0] literals[1] key[1] ... literals[-1]
+CompiledTemplate = Tuple[Tuple[str, ...], Tuple[str, ...]]
+
+
+@lru_cache(maxsize=128)
+def compile_template(template: str) -> CompiledTemplate:
+    """Split a template into literal segments and placeholder keys once; cached per template string."""
+    parts = _PLACEHOLDER_RE.split(template or "")
+    return tuple(parts[0::2]), tuple(parts[1::2])
+
+
+def render_compiled(compiled: CompiledTemplate, values: Dict[str, str]) -> str:
+    literals, keys = compiled
+    out = [literals[0]]
+    for key, literal in zip(keys, literals[1:]):
+        val = values.get(key)
+        out.append(f"{{{key}}}" if val is None else val)
+        out.append(literal)
+    return "".join(out)
+
+
 def render_custom_prompt(template: str, values: Dict[str, str]) -> str:
     """Replace known placeholders in the template. Unknown tokens are left intact."""
-    rendered = template or ""
-    for key, val in values.items():
-        rendered = rendered.replace(f"{{{key}}}", val)
-    return rendered
+    return render_compiled(compile_template(template or ""), values)
@@ -15,11 +15,17 @@ from typing import Optional
 
 class Referee:
     """Plain chess referee around python-chess Board and PGN export."""
+    __slots__ = ("board", "_headers", "_result_override", "_termination_comment", "_game", "_pgn_tail", "_pgn_moves")
+
     def __init__(self, starting_fen: str | None = None):
         self.board = chess.Board(fen=starting_fen) if starting_fen else chess.Board()
         self._headers: dict[str, str] = {}
         self._result_override: Optional[str] = None
         self._termination_comment: Optional[str] = None
+        # PGN node chain extended as moves are applied, so pgn() does not rebuild it
+        self._game = chess.pgn.Game()
+        self._pgn_tail: chess.pgn.GameNode = self._game
+        self._pgn_moves: list[chess.Move] = []
 
     # ---------------- Header / Result Management -----------------
     def set_headers(self, event: str = "LLM Chess Benchmark", site: str = "?", date: Optional[str] = None,
@@ -49,29 +55,38 @@ class Referee:
             mv = chess.Move.from_uci(uci)
         except Exception:
             return False, None
-        if mv not in self.board.legal_moves:
+        if not self.board.is_legal(mv):
             return False, None
         san = self.board.san(mv)
         self.board.push(mv)
+        self._extend_pgn(mv)
         return True, san
 
     def engine_apply(self, mv: chess.Move) -> str:
         san = self.board.san(mv)
         self.board.push(mv)
+        self._extend_pgn(mv)
         return san
 
+    def _extend_pgn(self, mv: chess.Move) -> None:
+        self._pgn_tail = self._pgn_tail.add_variation(mv)
+        self._pgn_moves.append(mv)
+
     # ---------------- PGN / Status -----------------
     def pgn(self) -> str:
-        game = chess.pgn.Game()
+        stack = self.board.move_stack
+        if self._pgn_moves != stack:
+            # Board was changed directly rather than through apply_uci/engine_apply: rebuild
+            self._game = self._pgn_tail = chess.pgn.Game()
+            self._pgn_moves = []
+            for mv in stack:
+                self._extend_pgn(mv)
+        game = self._game
         # headers
         for k, v in self._headers.items():
             game.headers[k] = v
         game.headers["Result"] = self.status()
-        node = game
-        for mv in list(self.board.move_stack):
-            node = node.add_variation(mv)
-        if self._termination_comment:
-            game.comment = self._termination_comment
+        game.comment = self._termination_comment or ""
         exporter = chess.pgn.StringExporter(headers=True, variations=False, comments=bool(self._termination_comment))
         return game.accept(exporter)
 
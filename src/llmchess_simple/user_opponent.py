@@ -1,31 +1,60 @@
 from __future__ import annotations
 """Interactive human opponent that only allows legal moves."""
+import sys
+
 import chess
 
+from .move_validator import UCI_RE
+
+_PROMPT = "Enter your move in SAN or UCI (e.g., e4 or e2e4): "
+_ILLEGAL = "Illegal move. Please try again with a legal move.\n"
+
 
 class UserOpponent:
+    __slots__ = ()
     name = "Human"
 
     def choose(self, board: chess.Board):
         """Prompt the user for a legal move; repeat until valid."""
-        while True:
+        # Generated once per turn so retries after bad input are lookups, not fresh movegen;
+        # the tuple backs both lookup tables (and any future "did you mean" hint)
+        legal = tuple(board.legal_moves)
+        legal_by_uci = {m.uci(): m for m in legal}
+        san_by_move: dict[str, chess.Move] | None = None  # filled on the first non-UCI input
+        interactive = sys.stdin.isatty()
+        if interactive:
+            # board does not change while we wait, so show it once rather than on every retry
             print("\nYour turn. Board FEN:", board.fen())
             print(board)
-            raw = input("Enter your move in SAN or UCI (e.g., e4 or e2e4): ").strip()
+        while True:
+            if interactive:
+                raw = input(_PROMPT)
+            else:
+                # Scripted play (piped stdin): one move per line, no prompt or board rendering
+                raw = sys.stdin.readline()
+                if not raw:
+                    raise EOFError("stdin closed while waiting for a move")
+            raw = raw.strip()
             if not raw:
                 continue
+            # Classify by shape and consult only the matching table (no exception-driven probing)
+            if UCI_RE.fullmatch(raw):
+                mv = legal_by_uci.get(raw.lower())
+            else:
+                if san_by_move is None:
+                    san_by_move = {board.san(m): m for m in legal}
+                mv = san_by_move.get(raw)
+            if mv:
+                return mv
             try:
-                mv = chess.Move.from_uci(raw) if len(raw) >= 4 else None
+                # Lenient forms (missing +/#, 0-0, long algebraic) still go through parse_san,
+                # which only returns legal moves (or the falsy null move for "--")
+                mv = board.parse_san(raw)
             except Exception:
                 mv = None
-            if not mv:
-                try:
-                    mv = board.parse_san(raw)
-                except Exception:
-                    mv = None
-            if mv and mv in board.legal_moves:
+            if mv:
                 return mv
-            print("Illegal move. Please try again with a legal move.")
+            sys.stdout.write(_ILLEGAL)
 
     def close(self):
         return